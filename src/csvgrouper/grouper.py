@@ -1,12 +1,19 @@
 """Core CSV grouping functionality."""
 
 import csv
+import io
 import json
-import re
+import os
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
+from fnmatch import fnmatch
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Callable, Iterator
+from typing import Callable, ClassVar, Iterable, Iterator, Mapping, TextIO
 
 
 class FieldType(Enum):
@@ -22,7 +29,7 @@ class FieldType(Enum):
     MIXED = "mixed"
 
 
-@dataclass
+@dataclass(slots=True)
 class CSVFile:
     """Represents a CSV file with its header and sample data."""
 
@@ -31,40 +38,74 @@ class CSVFile:
     sample_rows: list[list[str]] = field(default_factory=list)
     field_types: dict[str, str] = field(default_factory=dict)
     delimiter: str = ","
+    _field_set: frozenset[str] = field(init=False, repr=False, compare=False)
+    _field_count: int = field(init=False, repr=False, compare=False)
+
+    # Raw and normalized header -> shared normalized string
+    _header_cache: ClassVar[dict[str, str]] = {}
+
+    # Type name -> the matching FieldType value string
+    _type_names: ClassVar[dict[str, str]] = {t.value: t.value for t in FieldType}
+
+    def __post_init__(self) -> None:
+        """Normalize headers once so comparisons don't repeat the work."""
+        normalized = list(map(self._header_cache.get, self.headers))
+        if None in normalized:
+            normalized = map(self._normalize_header, self.headers)
+        self._field_set = frozenset(normalized)
+        self._field_count = len(self._field_set)
 
     @property
     def field_set(self) -> frozenset[str]:
         """Return normalized headers as a frozen set for comparison."""
-        return frozenset(self._normalize_header(header) for header in self.headers)
+        return self._field_set
 
-    @staticmethod
-    def _normalize_header(header: str) -> str:
+    @classmethod
+    def _normalize_header(cls, header: str) -> str:
         """Normalize a header for case-insensitive matching."""
-        return header.strip().casefold()
+        normalized = cls._header_cache.get(header)
+        if normalized is None:
+            normalized = header.strip().casefold()
+            normalized = cls._header_cache.setdefault(normalized, normalized)
+            cls._header_cache[header] = normalized
+        return normalized
 
     def to_dict(self) -> dict:
-        """Convert to dictionary for serialization."""
-        return {
-            "path": self.path,
-            "headers": self.headers,
-            "sample_rows": self.sample_rows,
-            "field_types": self.field_types,
-            "delimiter": self.delimiter,
-        }
+        """Convert to dictionary for serialization, omitting empty samples."""
+        data = {"path": self.path, "headers": self.headers}
+        if self.sample_rows:
+            data["sample_rows"] = self.sample_rows
+        data["field_types"] = self.field_types
+        data["delimiter"] = self.delimiter
+        return data
 
     @classmethod
-    def from_dict(cls, data: dict) -> "CSVFile":
-        """Create from dictionary."""
+    def from_dict(cls, data: dict, names: dict[str, str] | None = None) -> "CSVFile":
+        """
+        Create from dictionary.
+
+        Args:
+            data: Dictionary produced by ``to_dict``.
+            names: Header strings to reuse for equal header names, extended
+                with any new ones.
+        """
+        if names is None:
+            names = {}
+        share = names.setdefault
+        type_name = cls._type_names.get
         return cls(
             path=data["path"],
-            headers=data["headers"],
+            headers=[share(name, name) for name in data["headers"]],
             sample_rows=data.get("sample_rows", []),
-            field_types=data.get("field_types", {}),
+            field_types={
+                share(name, name): type_name(value, value)
+                for name, value in data.get("field_types", {}).items()
+            },
             delimiter=data.get("delimiter", ","),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CSVGroup:
     """A group of CSV files with similar field structures."""
 
@@ -78,22 +119,52 @@ class CSVGroup:
         """Return list of file paths in this group."""
         return [f.path for f in self.files]
 
-    def to_dict(self) -> dict:
-        """Convert to dictionary for serialization."""
+    def to_dict(self, paths_only: bool = False) -> dict:
+        """
+        Convert to dictionary for serialization.
+
+        Args:
+            paths_only: Store file paths instead of full file records, for
+                when the records are serialized separately.
+        """
         return {
             "name": self.name,
             "canonical_headers": self.canonical_headers,
-            "files": [f.to_dict() for f in self.files],
+            "files": (
+                self.file_paths if paths_only else [f.to_dict() for f in self.files]
+            ),
             "similarity_threshold": self.similarity_threshold,
         }
 
     @classmethod
-    def from_dict(cls, data: dict) -> "CSVGroup":
-        """Create from dictionary."""
+    def from_dict(
+        cls,
+        data: dict,
+        files: Mapping[str, CSVFile] | None = None,
+        names: dict[str, str] | None = None,
+    ) -> "CSVGroup":
+        """
+        Create from dictionary.
+
+        Args:
+            data: Dictionary produced by ``to_dict``.
+            files: Files by path, used to resolve a group stored with
+                ``paths_only=True`` to shared CSVFile instances.
+            names: Header strings to reuse for equal header names, extended
+                with any new ones.
+        """
+        if names is None:
+            names = {}
+        share = names.setdefault
+        file_entries = data.get("files", [])
         return cls(
             name=data["name"],
-            canonical_headers=data["canonical_headers"],
-            files=[CSVFile.from_dict(f) for f in data.get("files", [])],
+            canonical_headers=[share(name, name) for name in data["canonical_headers"]],
+            files=(
+                [files[path] for path in file_entries]
+                if files is not None
+                else [CSVFile.from_dict(f, names) for f in file_entries]
+            ),
             similarity_threshold=data.get("similarity_threshold", 1.0),
         )
 
@@ -101,27 +172,53 @@ class CSVGroup:
 class CSVGrouper:
     """Main class for grouping CSV files by field structure."""
 
-    # Patterns for type inference
-    _INT_PATTERN = re.compile(r"^-?\d+$")
-    _FLOAT_PATTERN = re.compile(r"^-?\d+\.\d+$")
-    _BOOL_PATTERN = re.compile(r"^(true|false|yes|no|1|0)$", re.IGNORECASE)
-    _DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
-    _DATETIME_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}")
+    # Candidate delimiters, in order of preference
+    _DELIMITERS = ",;\t|"
+
+    # Bytes read at a time from the start of each file during a scan
+    _READ_SIZE = 64 * 1024
+
+    # Reads scanned for the sample rows before switching to csv.reader
+    _HEAD_CHUNKS = 4
+
+    # Characters from the start of a file given to csv.Sniffer
+    _SNIFF_SIZE = 4096
+
+    # Buffer size used when streaming whole files
+    _STREAM_BUFFER_SIZE = 1024 * 1024
 
-    def __init__(self, sample_rows: int = 5):
+    # Lowercased values accepted as booleans during type inference
+    _BOOL_VALUES = frozenset({"true", "false", "yes", "no", "1", "0"})
+
+    # Most distinct headers encoded as bit masks when grouping by similarity
+    _MAX_MASK_BITS = 4096
+
+    # Field types that widen to float when seen together in one column
+    _NUMERIC_TYPES = frozenset({FieldType.INTEGER, FieldType.FLOAT})
+
+    def __init__(self, sample_rows: int = 5, keep_samples: bool = False):
         """
         Initialize the grouper.
 
         Args:
             sample_rows: Number of data rows to read for type inference.
+            keep_samples: Keep the sampled rows on each CSVFile after their
+                types are inferred. By default they are dropped to save
+                memory, since grouping only uses headers and field types.
         """
         self.sample_rows = sample_rows
+        self.keep_samples = keep_samples
         self._files: dict[str, CSVFile] = {}
+        self._names: dict[str, str] = {}
         self._groups: dict[str, CSVGroup] = {}
         self._processors: dict[str, Callable[[list[str]], None]] = {}
 
     def scan_directory(
-        self, directory: str | Path, recursive: bool = False, pattern: str = "*.csv"
+        self,
+        directory: str | Path,
+        recursive: bool = False,
+        pattern: str = "*.csv",
+        parallel: bool | int = True,
     ) -> list[CSVFile]:
         """
         Scan a directory for CSV files and extract their metadata.
@@ -130,57 +227,253 @@ class CSVGrouper:
             directory: Path to the directory to scan.
             recursive: Whether to scan subdirectories.
             pattern: Glob pattern for matching files.
+            parallel: Read files on a thread pool. True uses two workers per
+                CPU, False reads them one at a time on the calling thread,
+                and an int sets the number of workers.
 
         Returns:
-            List of CSVFile objects discovered.
+            List of CSVFile objects discovered, in discovery order.
         """
         directory = Path(directory)
         if not directory.is_dir():
             raise ValueError(f"Not a directory: {directory}")
 
-        glob_method = directory.rglob if recursive else directory.glob
+        paths = list(self._find_files(directory, pattern, recursive))
+        workers = self._scan_workers(parallel, len(paths))
         discovered = []
 
-        for csv_path in glob_method(pattern):
-            if csv_path.is_file():
-                try:
-                    csv_file = self._read_csv_metadata(csv_path)
-                    self._files[str(csv_path)] = csv_file
-                    discovered.append(csv_file)
-                except Exception as e:
-                    # Skip files that can't be parsed
-                    print(f"Warning: Could not parse {csv_path}: {e}")
+        if workers == 1:
+            for csv_path in paths:
+                self._record_scan(
+                    csv_path, partial(self._read_csv_metadata, csv_path), discovered
+                )
+            return discovered
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._read_csv_metadata, p) for p in paths]
+
+            # Results are collected in order on this thread, so the files
+            # index is only ever touched here
+            try:
+                for csv_path, future in zip(paths, futures):
+                    self._record_scan(csv_path, future.result, discovered)
+            except BaseException:
+                # Stop at once on interrupts instead of reading the rest
+                executor.shutdown(cancel_futures=True)
+                raise
 
         return discovered
 
-    def _detect_delimiter(self, file_path: Path) -> str:
-        """Detect the delimiter used in a CSV file."""
-        with open(file_path, "r", newline="", encoding="utf-8") as f:
-            sample = f.read(4096)
+    def _record_scan(
+        self,
+        csv_path: Path,
+        read: Callable[[], CSVFile],
+        discovered: list[CSVFile],
+    ) -> None:
+        """Add the file returned by ``read`` to the index, or warn if it fails."""
+        try:
+            csv_file = read()
+            self._files[str(csv_path)] = csv_file
+            discovered.append(csv_file)
+        except Exception as e:
+            # Skip files that can't be parsed
+            print(f"Warning: Could not parse {csv_path}: {e}")
+
+    @staticmethod
+    def _scan_workers(parallel: bool | int, path_count: int) -> int:
+        """Resolve the ``parallel`` argument of a scan to a worker count."""
+        if parallel is True:
+            workers = (os.cpu_count() or 1) * 2
+        elif parallel is False:
+            workers = 1
+        elif parallel < 1:
+            raise ValueError("parallel must be a bool or a positive worker count")
+        else:
+            workers = parallel
+        return max(1, min(workers, path_count))
+
+    @staticmethod
+    def _find_files(directory: Path, pattern: str, recursive: bool) -> Iterator[Path]:
+        """
+        Yield files under a directory whose names match a glob pattern.
+
+        Subdirectories are visited depth-first in listing order. Patterns
+        spanning directories fall back to ``Path.glob``.
+        """
+        if "/" in pattern or os.sep in pattern or "**" in pattern:
+            glob_method = directory.rglob if recursive else directory.glob
+            yield from (path for path in glob_method(pattern) if path.is_file())
+            return
+
+        pending = [directory]
+        while pending:
             try:
-                dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
-                return dialect.delimiter
-            except csv.Error:
-                return ","
+                entries = list(os.scandir(pending.pop()))
+            except PermissionError:
+                continue
 
-    def _read_csv_metadata(self, file_path: Path) -> CSVFile:
-        """Read only the header and sample rows from a CSV file."""
-        delimiter = self._detect_delimiter(file_path)
+            subdirectories = []
+            for entry in entries:
+                if recursive and entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif fnmatch(entry.name, pattern) and entry.is_file():
+                    yield Path(entry.path)
+
+            # Visit subdirectories depth-first, in the order they were listed
+            pending.extend(reversed(subdirectories))
+
+    def _detect_delimiter(self, sample: str) -> str:
+        """
+        Detect the delimiter used in a sample of CSV text.
 
-        with open(file_path, "r", newline="", encoding="utf-8") as f:
+        Picks the first candidate that appears the same, nonzero number of
+        times on the first two lines, otherwise asks ``csv.Sniffer``.
+        """
+        lines = sample.split("\n", 2)
+        # Quoted fields and rows ending in a bare "\r" are left to csv.Sniffer
+        if (
+            len(lines) >= 2
+            and "\r" not in lines[0][:-1]
+            and '"' not in lines[0]
+            and '"' not in lines[1]
+        ):
+            header, first_row = lines[0], lines[1]
+            for delimiter in self._DELIMITERS:
+                count = header.count(delimiter)
+                if count and count == first_row.count(delimiter):
+                    return delimiter
+
+        try:
+            dialect = csv.Sniffer().sniff(
+                sample[: self._SNIFF_SIZE], delimiters=self._DELIMITERS
+            )
+            return dialect.delimiter
+        except csv.Error:
+            return ","
+
+    def _read_head(
+        self, file_path: Path, row_count: int
+    ) -> tuple[str, str, bool] | None:
+        """
+        Read the start of a file up to the end of its first ``row_count`` rows.
+
+        Rows end at a line feed, a carriage return or both, and line ends
+        after an odd number of double quotes are taken to be inside a
+        quoted field. At most ``_HEAD_CHUNKS`` reads of ``_READ_SIZE`` bytes
+        are scanned.
+
+        Returns:
+            The text of the rows, that text extended to ``_SNIFF_SIZE``
+            bytes for delimiter detection, and whether the text runs to the
+            end of the file. None if the rows don't end within the scanned
+            bytes.
+        """
+        limit = self._HEAD_CHUNKS * self._READ_SIZE
+        with open(file_path, "rb") as f:
+            data = f.read(self._READ_SIZE)
+            start = 0
+            rows = 0
+            in_quotes = False
+
+            while rows < row_count:
+                newline = data.find(b"\n", start)
+                end = data.find(b"\r", start, newline if newline >= 0 else len(data))
+                if end < 0:
+                    end = newline
+                # A trailing "\r" may be the first half of a "\r\n"
+                if end < 0 or end == len(data) - 1 and data[end] == 0x0D:
+                    if len(data) >= limit:
+                        return None
+                    chunk = f.read(self._READ_SIZE)
+                    if chunk:
+                        data += chunk
+                        continue
+                    if end < 0:
+                        break
+
+                if data.count(b'"', start, end) % 2:
+                    in_quotes = not in_quotes
+                start = end + 2 if data[end : end + 2] == b"\r\n" else end + 1
+                if not in_quotes:
+                    rows += 1
+
+        if rows == row_count:
+            # Line end bytes never occur inside a multi-byte UTF-8 sequence
+            text = data[:start].decode("utf-8")
+            # Bad bytes past the rows only blur the sample, as they're unused
+            tail = data[start : self._SNIFF_SIZE].decode("utf-8", "replace")
+            return text, text + tail, False
+        text = data.decode("utf-8")
+        return text, text, True
+
+    def _stream_rows(
+        self, file_path: Path, row_count: int
+    ) -> tuple[str, list[list[str]]]:
+        """Detect the delimiter and read the first rows with ``csv.reader``."""
+        with open(file_path, newline="", encoding="utf-8") as f:
+            delimiter = self._detect_delimiter(f.read(self._SNIFF_SIZE))
+            f.seek(0)
             reader = csv.reader(f, delimiter=delimiter)
+            return delimiter, list(islice(reader, row_count))
 
-            # Read header
-            headers = next(reader, [])
-            if not headers:
-                raise ValueError(f"Empty CSV file: {file_path}")
+    @staticmethod
+    def _split_rows(
+        text: str, delimiter: str, row_count: int
+    ) -> list[list[str]] | None:
+        """
+        Split the first rows of CSV text with ``str.split``.
 
-            # Read sample rows
-            sample_rows = []
-            for i, row in enumerate(reader):
-                if i >= self.sample_rows:
-                    break
-                sample_rows.append(row)
+        Returns:
+            The rows, or None if a row contains a quote or a bare carriage
+            return and needs ``csv.reader``.
+        """
+        lines = text.split("\n", row_count)
+        if len(lines) > row_count or not lines[-1]:
+            # Drop the unparsed remainder or the empty tail after a newline
+            lines.pop()
+
+        rows = []
+        for line in lines:
+            if line.endswith("\r"):
+                line = line[:-1]
+            if '"' in line or "\r" in line:
+                return None
+            rows.append(line.split(delimiter) if line else [])
+        return rows
+
+    def _read_csv_metadata(self, file_path: Path) -> CSVFile:
+        """Read only the header and sample rows from a CSV file."""
+        wanted = self.sample_rows + 1
+        head = self._read_head(file_path, wanted)
+        if head is None:
+            delimiter, rows = self._stream_rows(file_path, wanted)
+        else:
+            text, sample, whole_file = head
+            delimiter = self._detect_delimiter(sample)
+            rows = self._split_rows(text, delimiter, wanted)
+            if rows is None:
+                # Strict parsing fails on a head cut inside a quoted field
+                reader = csv.reader(
+                    io.StringIO(text, newline=""),
+                    delimiter=delimiter,
+                    strict=not whole_file,
+                )
+                try:
+                    rows = list(islice(reader, wanted))
+                except csv.Error:
+                    rows = []
+            if len(rows) < wanted and not whole_file:
+                # The quote heuristic misjudged where the rows end
+                delimiter, rows = self._stream_rows(file_path, wanted)
+
+        # Read header
+        share = self._names.setdefault
+        headers = [share(name, name) for name in rows[0]] if rows else []
+        if not headers:
+            raise ValueError(f"Empty CSV file: {file_path}")
+
+        # Read sample rows
+        sample_rows = rows[1:wanted]
 
         # Infer field types from samples
         field_types = self._infer_field_types(headers, sample_rows)
@@ -188,7 +481,7 @@ class CSVGrouper:
         return CSVFile(
             path=str(file_path),
             headers=headers,
-            sample_rows=sample_rows,
+            sample_rows=sample_rows if self.keep_samples else [],
             field_types=field_types,
             delimiter=delimiter,
         )
@@ -197,48 +490,90 @@ class CSVGrouper:
         """Infer the type of a single value."""
         if not value or value.isspace():
             return FieldType.EMPTY
-        if self._DATETIME_PATTERN.match(value):
-            return FieldType.DATETIME
-        if self._DATE_PATTERN.match(value):
-            return FieldType.DATE
-        if self._BOOL_PATTERN.match(value):
-            return FieldType.BOOLEAN
-        if self._INT_PATTERN.match(value):
+
+        if value.isdecimal():
+            # "0" and "1" read as booleans
+            if value in self._BOOL_VALUES:
+                return FieldType.BOOLEAN
+            return FieldType.INTEGER
+
+        digits = value[1:] if value[0] == "-" else value
+        if digits.isdecimal():
             return FieldType.INTEGER
-        if self._FLOAT_PATTERN.match(value):
+        whole, dot, fraction = digits.partition(".")
+        if dot and whole.isdecimal() and fraction.isdecimal():
             return FieldType.FLOAT
+
+        length = len(value)
+        if (
+            length >= 10
+            and value[4] == "-"
+            and value[7] == "-"
+            and self._is_date(value)
+        ):
+            if length == 10:
+                return FieldType.DATE
+            if (
+                length >= 19
+                and value[10] in "T "
+                and value[13] == ":"
+                and value[16] == ":"
+                and value[11:13].isdecimal()
+                and value[14:16].isdecimal()
+                and value[17:19].isdecimal()
+            ):
+                return FieldType.DATETIME
+            return FieldType.STRING
+
+        # Only letter-led short values can spell true/false/yes/no
+        if length <= 5 and value[0].isalpha() and value.lower() in self._BOOL_VALUES:
+            return FieldType.BOOLEAN
         return FieldType.STRING
 
+    @staticmethod
+    def _is_date(value: str) -> bool:
+        """Check the YYYY-MM-DD digit groups at the start of a value."""
+        return (
+            value[:4].isdecimal() and value[5:7].isdecimal() and value[8:10].isdecimal()
+        )
+
     def _infer_field_types(
         self, headers: list[str], sample_rows: list[list[str]]
     ) -> dict[str, str]:
         """Infer types for each field based on sample values."""
-        field_types = {}
+        width = len(headers)
+        if sample_rows and all(len(row) == width for row in sample_rows):
+            columns = map(set, zip(*sample_rows))
+        else:
+            columns = (
+                {row[i] for row in sample_rows if i < len(row)} for i in range(width)
+            )
 
-        for i, header in enumerate(headers):
-            values = [row[i] for row in sample_rows if i < len(row)]
-            if not values:
-                field_types[header] = FieldType.EMPTY.value
-                continue
+        infer_column_type = self._infer_column_type
+        return {
+            header: infer_column_type(values).value
+            for header, values in zip(headers, columns)
+        }
 
-            types_seen = set()
-            for value in values:
-                inferred = self._infer_type(value)
-                if inferred != FieldType.EMPTY:
-                    types_seen.add(inferred)
+    def _infer_column_type(self, values: set[str]) -> FieldType:
+        """Reduce the distinct sample values of a column to a single type."""
+        infer_type = self._infer_type
+        numeric_types = self._NUMERIC_TYPES
+        types_seen = set()
 
-            if not types_seen:
-                field_types[header] = FieldType.EMPTY.value
-            elif len(types_seen) == 1:
-                field_types[header] = types_seen.pop().value
-            else:
-                # Multiple types seen - check for compatible numeric types
-                if types_seen <= {FieldType.INTEGER, FieldType.FLOAT}:
-                    field_types[header] = FieldType.FLOAT.value
-                else:
-                    field_types[header] = FieldType.MIXED.value
+        for value in values:
+            inferred = infer_type(value)
+            if inferred is not FieldType.EMPTY:
+                types_seen.add(inferred)
+                if len(types_seen) > 1 and not types_seen <= numeric_types:
+                    return FieldType.MIXED
 
-        return field_types
+        if not types_seen:
+            return FieldType.EMPTY
+        if len(types_seen) == 1:
+            return types_seen.pop()
+        # Integers and floats together widen to float
+        return FieldType.FLOAT
 
     def compute_similarity(self, file1: CSVFile, file2: CSVFile) -> float:
         """
@@ -255,8 +590,9 @@ class CSVGrouper:
         if not set1 or not set2:
             return 0.0
 
+        # |A | B| = |A| + |B| - |A & B|, so the union set is never built
         intersection = len(set1 & set2)
-        union = len(set1 | set2)
+        union = len(set1) + len(set2) - intersection
 
         return intersection / union
 
@@ -267,7 +603,21 @@ class CSVGrouper:
         Returns:
             Dictionary mapping group names to CSVGroup objects.
         """
-        return self.group_by_similarity(threshold=1.0)
+        buckets: defaultdict[frozenset[str], list[CSVFile]] = defaultdict(list)
+        for csv_file in self._files.values():
+            buckets[csv_file.field_set].append(csv_file)
+
+        self._groups.clear()
+        for group_counter, files in enumerate(buckets.values(), start=1):
+            group_name = f"group_{group_counter}"
+            self._groups[group_name] = CSVGroup(
+                name=group_name,
+                canonical_headers=list(files[0].headers),
+                files=files,
+                similarity_threshold=1.0,
+            )
+
+        return self._groups
 
     def group_by_similarity(self, threshold: float = 0.8) -> dict[str, CSVGroup]:
         """
@@ -282,13 +632,36 @@ class CSVGrouper:
         if not 0.0 <= threshold <= 1.0:
             raise ValueError("Threshold must be between 0.0 and 1.0")
 
+        if threshold == 1.0:
+            return self.group_by_exact_match()
+
         self._groups.clear()
-        ungrouped = list(self._files.values())
+        files = list(self._files.values())
+        masks = self._field_masks(files)
+        grouped = [False] * len(files)
+
+        # Inverted index from each file's rarest fields to the files that
+        # hold them. Files similar enough to a seed always share one of
+        # these prefix fields with it, so only those are scored.
+        prefixes = self._field_prefixes(files, threshold)
+        postings = defaultdict(list)
+        for index, prefix in enumerate(prefixes):
+            for name in prefix:
+                postings[name].append(index)
+
+        # File indices ordered by field count, so each seed can also be
+        # limited to the slice of candidates whose size can reach the
+        # threshold
+        by_size = sorted(range(len(files)), key=lambda i: files[i]._field_count)
+        sizes = [files[i]._field_count for i in by_size]
         group_counter = 0
 
-        while ungrouped:
+        for seed_index, seed in enumerate(files):
+            if grouped[seed_index]:
+                continue
+
             # Start a new group with the first ungrouped file
-            seed = ungrouped.pop(0)
+            grouped[seed_index] = True
             group_counter += 1
             group_name = f"group_{group_counter}"
 
@@ -299,20 +672,130 @@ class CSVGrouper:
                 similarity_threshold=threshold,
             )
 
-            # Find all files similar enough to the seed
-            still_ungrouped = []
-            for candidate in ungrouped:
-                similarity = self.compute_similarity(seed, candidate)
-                if similarity >= threshold:
-                    group.files.append(candidate)
-                else:
-                    still_ungrouped.append(candidate)
+            # Find all files similar enough to the seed, scanning whichever
+            # is shorter: the size window or the seed's posting lists. The
+            # window is widened by one on each side to absorb float
+            # rounding; the exact size check happens in _jaccard_if_above.
+            seed_size = seed._field_count
+            low = bisect_left(sizes, threshold * seed_size - 1)
+            high = (
+                bisect_right(sizes, seed_size / threshold + 1)
+                if threshold
+                else len(sizes)
+            )
+            candidates = by_size[low:high]
+            # A seed without fields has no postings and can only match
+            # other files without fields, which the window already holds
+            if threshold and seed_size:
+                seed_postings = [postings[name] for name in prefixes[seed_index]]
+                if sum(map(len, seed_postings)) < len(candidates):
+                    candidates = {i for posting in seed_postings for i in posting}
+            seed_mask = masks[seed_index]
+            matches = [
+                i
+                for i in candidates
+                if not grouped[i]
+                and self._jaccard_if_above(
+                    seed, files[i], threshold, seed_mask, masks[i]
+                )
+                is not None
+            ]
+
+            # Keep members in scan order
+            for i in sorted(matches):
+                grouped[i] = True
+                group.files.append(files[i])
 
-            ungrouped = still_ungrouped
             self._groups[group_name] = group
 
         return self._groups
 
+    def _jaccard_if_above(
+        self,
+        file1: CSVFile,
+        file2: CSVFile,
+        threshold: float,
+        mask1: int | None = None,
+        mask2: int | None = None,
+    ) -> float | None:
+        """
+        Return the similarity of two files if it reaches the threshold.
+
+        Pairs whose field counts alone rule them out are skipped. When
+        field masks from ``_field_masks`` are given, they are used for the
+        intersection instead of the field sets.
+
+        Returns:
+            The Jaccard similarity, or None if it is below the threshold.
+        """
+        size1 = file1._field_count
+        size2 = file2._field_count
+        if self._max_similarity(size1, size2) < threshold:
+            return None
+
+        if not size1 or not size2:
+            similarity = 1.0 if size1 == size2 else 0.0
+        else:
+            if mask1 is not None and mask2 is not None:
+                shared = (mask1 & mask2).bit_count()
+            else:
+                shared = len(file1._field_set & file2._field_set)
+            similarity = shared / (size1 + size2 - shared)
+
+        return similarity if similarity >= threshold else None
+
+    def _field_masks(self, files: list[CSVFile]) -> list[int] | list[None]:
+        """
+        Encode each file's field set as an int with one bit per header.
+
+        Bit positions are assigned per call to the distinct headers among
+        ``files``. Past ``_MAX_MASK_BITS`` headers every mask is None.
+        """
+        header_bits: dict[str, int] = {}
+        for csv_file in files:
+            for name in csv_file._field_set:
+                if name not in header_bits:
+                    header_bits[name] = len(header_bits)
+
+        if len(header_bits) > self._MAX_MASK_BITS:
+            return [None] * len(files)
+
+        masks = []
+        for csv_file in files:
+            mask = 0
+            for name in csv_file._field_set:
+                mask |= 1 << header_bits[name]
+            masks.append(mask)
+        return masks
+
+    @staticmethod
+    def _field_prefixes(files: list[CSVFile], threshold: float) -> list[list[str]]:
+        """
+        Pick the fields of each file that similar files must share.
+
+        Fields are ordered from rarest to most common across ``files``. Two
+        sets with Jaccard similarity of at least ``threshold`` overlap in at
+        least ``threshold * size`` fields of each, which forces a shared
+        field among the first ``size - threshold * size + 1`` in that
+        order. The prefix rounds the overlap down so it never comes out a
+        field short.
+        """
+        counts = Counter(name for f in files for name in f._field_set)
+        prefixes = []
+        for csv_file in files:
+            size = csv_file._field_count
+            keep = size - int(threshold * size) + 1
+            ordered = sorted(csv_file._field_set, key=lambda name: (counts[name], name))
+            prefixes.append(ordered[:keep])
+        return prefixes
+
+    @staticmethod
+    def _max_similarity(size1: int, size2: int) -> float:
+        """Upper bound on the Jaccard similarity of sets with these sizes."""
+        if size1 == size2:
+            return 1.0
+        return min(size1, size2) / max(size1, size2)
+
     def get_groups(self) -> dict[str, CSVGroup]:
         """Return current groups."""
         return self._groups
@@ -330,21 +813,48 @@ class CSVGrouper:
         """
         Save current groupings to a JSON file.
 
+        Each file record is stored once in a top-level ``files`` map, and
+        groups refer to their files by path. Each record is written on its
+        own line.
+
         Args:
             output_path: Path to save the JSON file.
         """
-        data = {
-            "groups": {name: g.to_dict() for name, g in self._groups.items()},
-            "sample_rows": self.sample_rows,
-        }
+        files = dict(self._files)
+        for group in self._groups.values():
+            for csv_file in group.files:
+                files.setdefault(csv_file.path, csv_file)
 
         with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+            f.write('{\n  "files": {')
+            self._write_json_members(
+                f, ((path, csv_file.to_dict()) for path, csv_file in files.items())
+            )
+            f.write('\n  },\n  "groups": {')
+            self._write_json_members(
+                f,
+                (
+                    (name, group.to_dict(paths_only=True))
+                    for name, group in self._groups.items()
+                ),
+            )
+            f.write(f'\n  }},\n  "sample_rows": {json.dumps(self.sample_rows)}\n}}\n')
+
+    @staticmethod
+    def _write_json_members(f: TextIO, members: Iterable[tuple[str, object]]) -> None:
+        """Write JSON object members one per line, each encoded compactly."""
+        separator = "\n"
+        for key, value in members:
+            f.write(f"{separator}    {json.dumps(key)}: {json.dumps(value)}")
+            separator = ",\n"
 
     def load_groupings(self, input_path: str | Path) -> dict[str, CSVGroup]:
         """
         Load groupings from a JSON file.
 
+        Files saved without a top-level ``files`` map, where each group
+        embeds its file records, are still accepted.
+
         Args:
             input_path: Path to the JSON file.
 
@@ -354,15 +864,26 @@ class CSVGrouper:
         with open(input_path, "r", encoding="utf-8") as f:
             data = json.load(f)
 
-        self._groups = {
-            name: CSVGroup.from_dict(g) for name, g in data.get("groups", {}).items()
-        }
-
-        # Rebuild files index from groups
         self._files.clear()
-        for group in self._groups.values():
-            for csv_file in group.files:
-                self._files[csv_file.path] = csv_file
+        self._names.clear()
+        groups_data = data.get("groups", {})
+
+        if "files" in data:
+            for path, file_data in data["files"].items():
+                self._files[path] = CSVFile.from_dict(file_data, self._names)
+            self._groups = {
+                name: CSVGroup.from_dict(g, files=self._files, names=self._names)
+                for name, g in groups_data.items()
+            }
+        else:
+            self._groups = {
+                name: CSVGroup.from_dict(g, names=self._names)
+                for name, g in groups_data.items()
+            }
+            # Rebuild files index from groups
+            for group in self._groups.values():
+                for csv_file in group.files:
+                    self._files[csv_file.path] = csv_file
 
         return self._groups
 
@@ -405,10 +926,38 @@ class CSVGrouper:
             raise ValueError(f"Unknown group: {group_name}")
 
         for csv_file in group.files:
-            with open(csv_file.path, "r", newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f, delimiter=csv_file.delimiter)
+            with open(
+                csv_file.path,
+                "r",
+                newline="",
+                encoding="utf-8",
+                buffering=self._STREAM_BUFFER_SIZE,
+            ) as f:
+                reader = csv.reader(f, delimiter=csv_file.delimiter)
+                fieldnames = next(reader, None)
+                if fieldnames is None:
+                    continue
+                width = len(fieldnames)
+
+                # Same rows as csv.DictReader, without its per-row overhead
                 for row in reader:
-                    yield csv_file.path, row
+                    if not row:
+                        continue
+                    if len(row) == width:
+                        yield csv_file.path, dict(zip(fieldnames, row))
+                    else:
+                        yield csv_file.path, self._ragged_row_to_dict(fieldnames, row)
+
+    @staticmethod
+    def _ragged_row_to_dict(fieldnames: list[str], row: list[str]) -> dict:
+        """Map a row whose length differs from the header like csv.DictReader."""
+        values = dict(zip(fieldnames, row))
+        if len(row) > len(fieldnames):
+            values[None] = row[len(fieldnames) :]
+        else:
+            for key in fieldnames[len(row) :]:
+                values[key] = None
+        return values
 
     def summary(self) -> str:
         """Return a human-readable summary of current groupings."""
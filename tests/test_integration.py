@@ -1,12 +1,15 @@
 """Integration tests using real CSV test data files."""
 
+import csv
 import json
 import tempfile
+import threading
+import time
 from pathlib import Path
 
 import pytest
 
-from csvgrouper import CSVGrouper, CSVFile
+from csvgrouper import CSVGrouper, CSVFile, CSVGroup
 
 
 # Path to test data relative to project root
@@ -48,11 +51,151 @@ class TestDirectoryScanning:
         for f in files:
             assert len(f.sample_rows) <= 5  # sample_rows=5
 
+    def test_scan_keeps_sample_rows_when_requested(self):
+        grouper = CSVGrouper(sample_rows=2, keep_samples=True)
+        files = grouper.scan_directory(TEST_DATA_DIR)
+        assert all(len(f.sample_rows) == 2 for f in files)
+
+    def test_scan_drops_sample_rows_by_default(self, grouper):
+        files = grouper.scan_directory(TEST_DATA_DIR)
+        assert all(f.sample_rows == [] for f in files)
+        assert all(f.field_types for f in files)
+
     def test_scan_infers_field_types(self, grouper):
         files = grouper.scan_directory(TEST_DATA_DIR)
         for f in files:
             assert len(f.field_types) == len(f.headers)
 
+    def test_scan_reads_rows_past_head_buffer(self):
+        grouper = CSVGrouper(sample_rows=5, keep_samples=True)
+        # Force the sample rows to straddle the initial read buffer
+        grouper._READ_SIZE = 16
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write("id,note\n")
+            f.write('1,"multi\nline"\n')
+            f.write("2,plain\n")
+            temp_path = f.name
+
+        try:
+            temp_dir = Path(temp_path).parent
+            files = grouper.scan_directory(temp_dir, pattern=Path(temp_path).name)
+
+            assert files[0].headers == ["id", "note"]
+            assert files[0].sample_rows == [["1", "multi\nline"], ["2", "plain"]]
+        finally:
+            Path(temp_path).unlink()
+
+    def test_scan_reads_carriage_return_line_endings(self):
+        grouper = CSVGrouper(sample_rows=2, keep_samples=True)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "cr.csv"
+            path.write_bytes(b"id,name\r1,a\r2,b\r" + b"3,c\r" * 1000)
+
+            text, _, whole_file = grouper._read_head(path, 3)
+            assert (text, whole_file) == ("id,name\r1,a\r2,b\r", False)
+            files = grouper.scan_directory(temp_dir)
+
+            assert files[0].headers == ["id", "name"]
+            assert files[0].sample_rows == [["1", "a"], ["2", "b"]]
+
+    def test_scan_streams_rows_past_head_limit(self):
+        grouper = CSVGrouper(sample_rows=3, keep_samples=True)
+        grouper._READ_SIZE = 16
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "inches.csv"
+            # The unquoted inch mark looks like an open quoted field
+            path.write_text("name,height\nbob,5'10\"\n" + "amy,6\n" * 100)
+
+            assert grouper._read_head(path, 4) is None
+            files = grouper.scan_directory(temp_dir)
+
+            assert files[0].headers == ["name", "height"]
+            assert files[0].sample_rows == [
+                ["bob", "5'10\""],
+                ["amy", "6"],
+                ["amy", "6"],
+            ]
+
+    def test_scan_rereads_head_cut_inside_quoted_field(self):
+        grouper = CSVGrouper(sample_rows=1, keep_samples=True)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "inch_then_quote.csv"
+            # The inch mark makes the head scan end the row inside "two\n
+            path.write_text(
+                'id,size,note,flag\n1,5" pipe,"two\nlines",yes\n' + "2,3,x,no\n" * 50
+            )
+
+            files = grouper.scan_directory(temp_dir)
+
+            assert files[0].sample_rows == [["1", '5" pipe', "two\nlines", "yes"]]
+            assert files[0].field_types["flag"] == "boolean"
+
+    def test_scan_ignores_bytes_after_sample_rows(self, grouper):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "tail.csv"
+            path.write_bytes(b"a,b\n" + b"10,20\n" * 5000 + b"\xff\n")
+
+            files = grouper.scan_directory(temp_dir)
+
+            assert files[0].headers == ["a", "b"]
+            assert files[0].field_types == {"a": "integer", "b": "integer"}
+
+    def test_scan_recursive_finds_nested_files(self, grouper):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            nested = Path(temp_dir) / "sub" / "deeper"
+            nested.mkdir(parents=True)
+            (Path(temp_dir) / "top.csv").write_text("a,b\n1,2\n")
+            (nested / "inner.csv").write_text("a,b\n3,4\n")
+            (nested / "notes.txt").write_text("a,b\n")
+
+            flat = grouper.scan_directory(temp_dir)
+            deep = grouper.scan_directory(temp_dir, recursive=True)
+
+            assert [Path(f.path).name for f in flat] == ["top.csv"]
+            assert sorted(Path(f.path).name for f in deep) == ["inner.csv", "top.csv"]
+
+    def test_scan_parallel_matches_sequential(self):
+        sequential = CSVGrouper().scan_directory(TEST_DATA_DIR, parallel=False)
+        threaded = CSVGrouper().scan_directory(TEST_DATA_DIR, parallel=4)
+        assert threaded == sequential
+
+    def test_scan_invalid_worker_count_raises(self, grouper):
+        with pytest.raises(ValueError, match="parallel"):
+            grouper.scan_directory(TEST_DATA_DIR, parallel=0)
+
+    def test_scan_without_parallel_reads_on_calling_thread(self, grouper):
+        threads = set()
+        read_csv_metadata = grouper._read_csv_metadata
+
+        def tracked_read(path):
+            threads.add(threading.current_thread())
+            return read_csv_metadata(path)
+
+        grouper._read_csv_metadata = tracked_read
+        files = grouper.scan_directory(TEST_DATA_DIR, parallel=False)
+
+        assert files
+        assert threads == {threading.current_thread()}
+
+    def test_scan_interrupt_cancels_pending_reads(self, grouper):
+        read = []
+
+        def interrupted_read(path):
+            read.append(path)
+            if len(read) == 1:
+                raise KeyboardInterrupt
+            time.sleep(0.01)
+
+        grouper._read_csv_metadata = interrupted_read
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for i in range(20):
+                (Path(temp_dir) / f"{i}.csv").write_text("a,b\n")
+
+            with pytest.raises(KeyboardInterrupt):
+                grouper.scan_directory(temp_dir, parallel=1)
+
+        assert len(read) < 20
+
     def test_scan_nonexistent_directory_raises(self, grouper):
         with pytest.raises(ValueError, match="Not a directory"):
             grouper.scan_directory("/nonexistent/path")
@@ -314,6 +457,36 @@ class TestIterGroupRows:
             assert isinstance(row, dict)
             break  # Just check first row
 
+    def test_iter_group_rows_matches_dict_reader(self, grouper):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write("a,b,c\n1,2,3\n\n4,5\n6,7,8,9\n")
+            temp_path = f.name
+
+        try:
+            temp_dir = Path(temp_path).parent
+            grouper.scan_directory(temp_dir, pattern=Path(temp_path).name)
+            grouper.group_by_exact_match()
+
+            rows = [row for _, row in grouper.iter_group_rows("group_1")]
+            with open(temp_path, newline="") as f:
+                assert rows == list(csv.DictReader(f))
+        finally:
+            Path(temp_path).unlink()
+
+    def test_iter_group_rows_skips_blank_rows_after_blank_header(self, grouper):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "blank_header.csv"
+            path.write_text("\n1,2\n\n3,4\n")
+            csv_file = CSVFile(path=str(path), headers=[])
+            grouper._groups = {
+                "blank": CSVGroup(name="blank", canonical_headers=[], files=[csv_file])
+            }
+
+            rows = [row for _, row in grouper.iter_group_rows("blank")]
+            with open(path, newline="") as f:
+                assert rows == list(csv.DictReader(f))
+            assert rows == [{None: ["1", "2"]}, {None: ["3", "4"]}]
+
     def test_iter_unknown_group_raises(self, loaded_grouper):
         loaded_grouper.group_by_exact_match()
 
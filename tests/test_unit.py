@@ -9,6 +9,12 @@ import pytest
 from csvgrouper import CSVGrouper, CSVFile, CSVGroup, FieldType
 
 
+@pytest.fixture(scope="module")
+def grouper():
+    """Shared CSVGrouper for tests that don't change its state."""
+    return CSVGrouper()
+
+
 class TestCSVFile:
     """Tests for CSVFile dataclass."""
 
@@ -31,6 +37,55 @@ class TestCSVFile:
         )
         assert csv_file.field_set == frozenset(["name", "email", "value"])
 
+    def test_normalized_headers_are_shared(self):
+        file1 = CSVFile(path="/test/1.csv", headers=[" Name"])
+        file2 = CSVFile(path="/test/2.csv", headers=["NAME "])
+        (name1,) = file1.field_set
+        (name2,) = file2.field_set
+        assert name1 == "name"
+        assert name1 is name2
+
+    def test_from_dict_shares_headers(self):
+        # Build the strings at runtime so they start out as distinct objects
+        header = "".join(["customer", "_id"])
+        names = {}
+        file1 = CSVFile.from_dict(
+            {"path": "/1.csv", "headers": [header], "field_types": {header: "integer"}},
+            names,
+        )
+        file2 = CSVFile.from_dict(
+            {"path": "/2.csv", "headers": ["".join(["customer_", "id"])]}, names
+        )
+        assert file1.headers[0] is file2.headers[0]
+        assert next(iter(file1.field_types)) is file2.headers[0]
+        assert names == {"customer_id": "customer_id"}
+
+    def test_from_dict_shares_type_names(self):
+        # json.loads gives each value its own string object
+        data = json.loads('[{"a": "integer"}, {"b": "integer"}]')
+        file1 = CSVFile.from_dict(
+            {"path": "/1.csv", "headers": ["a"], "field_types": data[0]}
+        )
+        file2 = CSVFile.from_dict(
+            {"path": "/2.csv", "headers": ["b"], "field_types": data[1]}
+        )
+        assert file1.field_types["a"] is file2.field_types["b"]
+        assert file1.field_types["a"] is FieldType.INTEGER.value
+
+    def test_field_set_is_computed_once(self):
+        csv_file = CSVFile(path="/test/file.csv", headers=["a", "b"])
+        assert csv_file.field_set is csv_file.field_set
+
+    def test_to_dict_excludes_cached_fields(self):
+        csv_file = CSVFile(path="/test/file.csv", headers=["A"])
+        data = csv_file.to_dict()
+        assert "_field_set" not in data
+        assert CSVFile.from_dict(data).field_set == frozenset(["a"])
+
+    def test_uses_slots(self):
+        csv_file = CSVFile(path="/test/file.csv", headers=["a"])
+        assert not hasattr(csv_file, "__dict__")
+
     def test_to_dict_roundtrip(self):
         original = CSVFile(
             path="/test/file.csv",
@@ -48,6 +103,12 @@ class TestCSVFile:
         assert restored.field_types == original.field_types
         assert restored.delimiter == original.delimiter
 
+    def test_to_dict_omits_empty_sample_rows(self):
+        csv_file = CSVFile(path="/test/file.csv", headers=["a"])
+        data = csv_file.to_dict()
+        assert "sample_rows" not in data
+        assert CSVFile.from_dict(data).sample_rows == []
+
     def test_from_dict_with_defaults(self):
         data = {"path": "/test.csv", "headers": ["a", "b"]}
         csv_file = CSVFile.from_dict(data)
@@ -71,6 +132,10 @@ class TestCSVGroup:
         )
         assert group.file_paths == ["/test/1.csv", "/test/2.csv"]
 
+    def test_uses_slots(self):
+        group = CSVGroup(name="test_group", canonical_headers=["a"])
+        assert not hasattr(group, "__dict__")
+
     def test_file_paths_empty_group(self):
         group = CSVGroup(name="empty", canonical_headers=["a"])
         assert group.file_paths == []
@@ -118,122 +183,203 @@ class TestFieldType:
 class TestCSVGrouperTypeInference:
     """Tests for type inference functionality."""
 
-    def test_infer_integer(self):
-        grouper = CSVGrouper()
+    def test_infer_integer(self, grouper):
         assert grouper._infer_type("123") == FieldType.INTEGER
         assert grouper._infer_type("-456") == FieldType.INTEGER
         assert grouper._infer_type("42") == FieldType.INTEGER
         # Note: "0" and "1" match boolean pattern first
 
-    def test_infer_float(self):
-        grouper = CSVGrouper()
+    def test_infer_zero_and_one_as_boolean(self, grouper):
+        assert grouper._infer_type("0") == FieldType.BOOLEAN
+        assert grouper._infer_type("1") == FieldType.BOOLEAN
+        assert grouper._infer_type("10") == FieldType.INTEGER
+        assert grouper._infer_type("-1") == FieldType.INTEGER
+
+    def test_infer_float(self, grouper):
         assert grouper._infer_type("123.45") == FieldType.FLOAT
         assert grouper._infer_type("-0.5") == FieldType.FLOAT
 
-    def test_infer_boolean(self):
-        grouper = CSVGrouper()
+    def test_infer_boolean(self, grouper):
         assert grouper._infer_type("true") == FieldType.BOOLEAN
         assert grouper._infer_type("FALSE") == FieldType.BOOLEAN
         assert grouper._infer_type("yes") == FieldType.BOOLEAN
         assert grouper._infer_type("No") == FieldType.BOOLEAN
 
-    def test_infer_date(self):
-        grouper = CSVGrouper()
+    def test_infer_date(self, grouper):
         assert grouper._infer_type("2024-01-15") == FieldType.DATE
         assert grouper._infer_type("2024-12-31") == FieldType.DATE
 
-    def test_infer_datetime(self):
-        grouper = CSVGrouper()
+    def test_infer_datetime(self, grouper):
         assert grouper._infer_type("2024-01-15T10:30:00") == FieldType.DATETIME
         assert grouper._infer_type("2024-01-15 10:30:00") == FieldType.DATETIME
 
-    def test_infer_string(self):
-        grouper = CSVGrouper()
+    def test_infer_string(self, grouper):
         assert grouper._infer_type("hello") == FieldType.STRING
         assert grouper._infer_type("foo bar") == FieldType.STRING
         assert grouper._infer_type("123abc") == FieldType.STRING
 
-    def test_infer_empty(self):
-        grouper = CSVGrouper()
+    def test_infer_near_misses_are_strings(self, grouper):
+        assert grouper._infer_type("2024-01-15x") == FieldType.STRING
+        assert grouper._infer_type("2024-01-15T10:30") == FieldType.STRING
+        assert grouper._infer_type("1.2.3") == FieldType.STRING
+        assert grouper._infer_type("-") == FieldType.STRING
+        assert grouper._infer_type(" 42") == FieldType.STRING
+
+    def test_infer_empty(self, grouper):
         assert grouper._infer_type("") == FieldType.EMPTY
         assert grouper._infer_type("   ") == FieldType.EMPTY
 
-    def test_infer_field_types_single_type(self):
-        grouper = CSVGrouper()
+    def test_infer_field_types_single_type(self, grouper):
         headers = ["count"]
         # Use values that don't match boolean pattern (0, 1)
         sample_rows = [["10"], ["20"], ["30"]]
         types = grouper._infer_field_types(headers, sample_rows)
         assert types["count"] == "integer"
 
-    def test_infer_field_types_mixed_numeric(self):
-        grouper = CSVGrouper()
+    def test_infer_field_types_mixed_numeric(self, grouper):
         headers = ["value"]
         # Use values that don't match boolean pattern
         sample_rows = [["10"], ["2.5"], ["30"]]
         types = grouper._infer_field_types(headers, sample_rows)
         assert types["value"] == "float"
 
-    def test_infer_field_types_mixed_incompatible(self):
-        grouper = CSVGrouper()
+    def test_infer_field_types_mixed_incompatible(self, grouper):
         headers = ["data"]
         sample_rows = [["123"], ["hello"], ["456"]]
         types = grouper._infer_field_types(headers, sample_rows)
         assert types["data"] == "mixed"
 
+    def test_infer_field_types_short_rows(self, grouper):
+        headers = ["id", "note"]
+        sample_rows = [["10"], ["20"], ["30", ""]]
+        types = grouper._infer_field_types(headers, sample_rows)
+        assert types == {"id": "integer", "note": "empty"}
+
+    def test_infer_field_types_no_rows(self, grouper):
+        types = grouper._infer_field_types(["a", "b"], [])
+        assert types == {"a": "empty", "b": "empty"}
+
+    def test_infer_field_types_mixed_with_repeats(self, grouper):
+        headers = ["data"]
+        sample_rows = [["abc"], ["12"], ["abc"], ["1.5"], ["12"]]
+        types = grouper._infer_field_types(headers, sample_rows)
+        assert types["data"] == "mixed"
+
+    def test_infer_column_type(self, grouper):
+        assert grouper._infer_column_type(set()) == FieldType.EMPTY
+        assert grouper._infer_column_type({"", "  "}) == FieldType.EMPTY
+        assert grouper._infer_column_type({"12", "", "3.5"}) == FieldType.FLOAT
+        assert grouper._infer_column_type({"12", "true"}) == FieldType.MIXED
+
+
+class TestCSVGrouperDelimiterDetection:
+    """Tests for delimiter detection on sample text."""
+
+    def test_detects_consistent_delimiter(self, grouper):
+        assert grouper._detect_delimiter("a\tb\tc\n1\t2\t3\n") == "\t"
+        assert grouper._detect_delimiter("a|b\n1|2\n") == "|"
+
+    def test_prefers_comma_on_ties(self, grouper):
+        assert grouper._detect_delimiter("a;b,c\n1;2,3\n") == ","
+
+    def test_skips_delimiters_with_unequal_counts(self, grouper):
+        assert grouper._detect_delimiter("a;b;c\n1,5;2;3\n") == ";"
+
+    def test_single_column_defaults_to_comma(self, grouper):
+        assert grouper._detect_delimiter("value\n1\n") == ","
+
+    def test_ignores_delimiters_inside_quotes(self, grouper):
+        sample = '"Last, First";age\n"Doe, J";30\n'
+        assert grouper._detect_delimiter(sample) == ";"
+
+
+class TestCSVGrouperRowSplitting:
+    """Tests for the unquoted row splitting fast path."""
+
+    def test_splits_requested_rows(self):
+        text = "a,b\r\n1,2\r\n\r\n3,4\r\n"
+        rows = CSVGrouper._split_rows(text, ",", 3)
+        assert rows == [["a", "b"], ["1", "2"], []]
+
+    def test_keeps_unterminated_last_row(self):
+        assert CSVGrouper._split_rows("a;b\n1;2", ";", 5) == [["a", "b"], ["1", "2"]]
+
+    def test_empty_text_has_no_rows(self):
+        assert CSVGrouper._split_rows("", ",", 2) == []
+
+    def test_quoted_rows_need_full_parser(self):
+        assert CSVGrouper._split_rows('a,b\n"1,5",2\n', ",", 2) is None
+
+    def test_quotes_after_requested_rows_are_ignored(self):
+        assert CSVGrouper._split_rows('a,b\n"1,5",2\n', ",", 1) == [["a", "b"]]
+
+    def test_bare_carriage_return_needs_full_parser(self):
+        assert CSVGrouper._split_rows("a,b\r1,2\n", ",", 2) is None
+
 
 class TestCSVGrouperSimilarity:
     """Tests for similarity computation."""
 
-    def test_identical_files_similarity_is_one(self):
-        grouper = CSVGrouper()
+    def test_identical_files_similarity_is_one(self, grouper):
         file1 = CSVFile(path="/1.csv", headers=["a", "b", "c"])
         file2 = CSVFile(path="/2.csv", headers=["a", "b", "c"])
         assert grouper.compute_similarity(file1, file2) == 1.0
 
-    def test_identical_files_different_order(self):
-        grouper = CSVGrouper()
+    def test_identical_files_different_order(self, grouper):
         file1 = CSVFile(path="/1.csv", headers=["a", "b", "c"])
         file2 = CSVFile(path="/2.csv", headers=["c", "a", "b"])
         assert grouper.compute_similarity(file1, file2) == 1.0
 
-    def test_no_overlap_similarity_is_zero(self):
-        grouper = CSVGrouper()
+    def test_no_overlap_similarity_is_zero(self, grouper):
         file1 = CSVFile(path="/1.csv", headers=["a", "b"])
         file2 = CSVFile(path="/2.csv", headers=["x", "y"])
         assert grouper.compute_similarity(file1, file2) == 0.0
 
-    def test_partial_overlap(self):
-        grouper = CSVGrouper()
+    def test_partial_overlap(self, grouper):
         file1 = CSVFile(path="/1.csv", headers=["a", "b", "c", "d"])
         file2 = CSVFile(path="/2.csv", headers=["a", "b"])
         # intersection = 2, union = 4
         assert grouper.compute_similarity(file1, file2) == 0.5
 
-    def test_both_empty_similarity_is_one(self):
-        grouper = CSVGrouper()
+    def test_overlap_with_duplicate_headers(self, grouper):
+        file1 = CSVFile(path="/1.csv", headers=["a", "A", "b", "c"])
+        file2 = CSVFile(path="/2.csv", headers=["b", "c", "d"])
+        # field sets {a, b, c} and {b, c, d}: intersection = 2, union = 4
+        assert grouper.compute_similarity(file1, file2) == 0.5
+
+    def test_both_empty_similarity_is_one(self, grouper):
         file1 = CSVFile(path="/1.csv", headers=[])
         file2 = CSVFile(path="/2.csv", headers=[])
         assert grouper.compute_similarity(file1, file2) == 1.0
 
-    def test_one_empty_similarity_is_zero(self):
-        grouper = CSVGrouper()
+    def test_one_empty_similarity_is_zero(self, grouper):
         file1 = CSVFile(path="/1.csv", headers=["a", "b"])
         file2 = CSVFile(path="/2.csv", headers=[])
         assert grouper.compute_similarity(file1, file2) == 0.0
 
-    def test_case_differences_are_treated_as_matches(self):
-        grouper = CSVGrouper()
+    def test_case_differences_are_treated_as_matches(self, grouper):
         file1 = CSVFile(path="/1.csv", headers=["Name", "Email"])
         file2 = CSVFile(path="/2.csv", headers=["name", "EMAIL"])
         assert grouper.compute_similarity(file1, file2) == 1.0
 
-    def test_surrounding_whitespace_is_ignored(self):
-        grouper = CSVGrouper()
+    def test_surrounding_whitespace_is_ignored(self, grouper):
         file1 = CSVFile(path="/1.csv", headers=[" name ", "value"])
         file2 = CSVFile(path="/2.csv", headers=["name", " Value "])
         assert grouper.compute_similarity(file1, file2) == 1.0
 
+    def test_jaccard_if_above_threshold(self, grouper):
+        file1 = CSVFile(path="/1.csv", headers=["a", "b", "c", "d"])
+        file2 = CSVFile(path="/2.csv", headers=["a", "b", "e"])
+        # intersection = 2, union = 5
+        assert grouper._jaccard_if_above(file1, file2, 0.4) == 0.4
+        assert grouper._jaccard_if_above(file1, file2, 0.5) is None
+
+    def test_jaccard_if_above_rejects_by_size(self, grouper):
+        file1 = CSVFile(path="/1.csv", headers=["a", "b", "c", "d"])
+        file2 = CSVFile(path="/2.csv", headers=["a"])
+        assert grouper._jaccard_if_above(file1, file2, 0.3) is None
+        assert grouper._jaccard_if_above(file1, file2, 0.25) == 0.25
+
 
 class TestCSVGrouperGrouping:
     """Tests for grouping logic."""
@@ -273,6 +419,74 @@ class TestCSVGrouperGrouping:
         # At 0.2 threshold, b and c should merge
         assert len(groups) < 3
 
+    def test_exact_match_keeps_scan_order(self, grouper_with_files):
+        groups = grouper_with_files.group_by_exact_match()
+
+        assert list(groups) == ["group_1", "group_2", "group_3"]
+        assert groups["group_1"].file_paths == ["/a1.csv", "/a2.csv"]
+        assert groups["group_1"].canonical_headers == ["x", "y", "z"]
+        assert groups["group_2"].file_paths == ["/b1.csv", "/b2.csv"]
+        assert groups["group_3"].file_paths == ["/c1.csv"]
+
+    def test_similarity_at_size_ratio_boundary(self):
+        # {a, b} is a subset of {a, b, c, d}: similarity equals 2/4 exactly
+        grouper = CSVGrouper()
+        grouper._files = {
+            "/1.csv": CSVFile(path="/1.csv", headers=["a", "b", "c", "d"]),
+            "/2.csv": CSVFile(path="/2.csv", headers=["a", "b"]),
+        }
+        assert len(grouper.group_by_similarity(threshold=0.5)) == 1
+        assert len(grouper.group_by_similarity(threshold=0.51)) == 2
+
+    def test_field_masks_share_bits_for_shared_fields(self, grouper_with_files):
+        files = list(grouper_with_files._files.values())
+        masks = grouper_with_files._field_masks(files)
+
+        assert masks[0] == masks[1]
+        assert (masks[2] & masks[4]).bit_count() == 1  # both have "p"
+        assert [m.bit_count() for m in masks] == [3, 3, 2, 2, 4]
+
+    def test_similarity_without_masks_gives_same_groups(self, grouper_with_files):
+        with_masks = {
+            name: g.file_paths
+            for name, g in grouper_with_files.group_by_similarity(0.2).items()
+        }
+        grouper_with_files._MAX_MASK_BITS = 0
+        without_masks = {
+            name: g.file_paths
+            for name, g in grouper_with_files.group_by_similarity(0.2).items()
+        }
+        assert with_masks == without_masks
+
+    def test_field_prefixes_keep_rarest_fields(self):
+        files = [
+            CSVFile(path="/1.csv", headers=["id", "name", "email", "phone"]),
+            CSVFile(path="/2.csv", headers=["id", "name", "city"]),
+            CSVFile(path="/3.csv", headers=["id", "zip"]),
+        ]
+        prefixes = CSVGrouper._field_prefixes(files, 0.5)
+        # 4 - 2 + 1 = 3 fields, "id" (in every file) is dropped first
+        assert prefixes[0] == ["email", "phone", "name"]
+        # An overlap of 1.5 fields rounds down to 1, so all 3 are kept
+        assert prefixes[1] == ["city", "name", "id"]
+        assert prefixes[2] == ["zip", "id"]
+        assert CSVGrouper._field_prefixes(files, 0.0)[0] == prefixes[0] + ["id"]
+
+    def test_similarity_with_posting_candidates(self):
+        # Same-sized files fill the size window, so seeds take candidates
+        # from their posting lists instead
+        grouper = CSVGrouper()
+        headers = [[f"a{i}", f"b{i}", "id"] for i in range(10)]
+        headers.append(["a3", "b3", "id"])
+        grouper._files = {
+            f"/{i}.csv": CSVFile(path=f"/{i}.csv", headers=h)
+            for i, h in enumerate(headers)
+        }
+        groups = grouper.group_by_similarity(threshold=0.8)
+
+        assert len(groups) == 10
+        assert groups["group_4"].file_paths == ["/3.csv", "/10.csv"]
+
     def test_invalid_threshold_raises(self, grouper_with_files):
         with pytest.raises(ValueError):
             grouper_with_files.group_by_similarity(threshold=1.5)
@@ -345,6 +559,107 @@ class TestCSVGrouperPersistence:
         finally:
             Path(temp_path).unlink()
 
+    def test_save_writes_one_record_per_line(self):
+        grouper = CSVGrouper(sample_rows=2)
+        grouper._files = {
+            "/1.csv": CSVFile(path="/1.csv", headers=["a"]),
+            "/2.csv": CSVFile(path="/2.csv", headers=["b"]),
+        }
+        grouper.group_by_exact_match()
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            temp_path = f.name
+
+        try:
+            grouper.save_groupings(temp_path)
+            text = Path(temp_path).read_text()
+
+            assert json.loads(text) == {
+                "files": {path: f.to_dict() for path, f in grouper._files.items()},
+                "groups": {
+                    name: g.to_dict(paths_only=True)
+                    for name, g in grouper.get_groups().items()
+                },
+                "sample_rows": 2,
+            }
+            assert len(text.splitlines()) == 11
+        finally:
+            Path(temp_path).unlink()
+
+    def test_load_shares_files_between_index_and_groups(self):
+        grouper = CSVGrouper()
+        grouper._files = {
+            "/1.csv": CSVFile(path="/1.csv", headers=["a"]),
+            "/2.csv": CSVFile(path="/2.csv", headers=["a"]),
+        }
+        grouper.group_by_exact_match()
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            temp_path = f.name
+
+        try:
+            grouper.save_groupings(temp_path)
+
+            new_grouper = CSVGrouper()
+            group = new_grouper.load_groupings(temp_path)["group_1"]
+            assert group.files[0] is new_grouper._files["/1.csv"]
+            assert group.files[1] is new_grouper._files["/2.csv"]
+        finally:
+            Path(temp_path).unlink()
+
+    def test_load_groups_with_embedded_files(self):
+        group = CSVGroup(
+            name="group_1",
+            canonical_headers=["a"],
+            files=[CSVFile(path="/1.csv", headers=["a"])],
+        )
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            json.dump({"groups": {"group_1": group.to_dict()}, "sample_rows": 5}, f)
+            temp_path = f.name
+
+        try:
+            grouper = CSVGrouper()
+            loaded_groups = grouper.load_groupings(temp_path)
+
+            assert loaded_groups["group_1"].file_paths == ["/1.csv"]
+            assert list(grouper._files) == ["/1.csv"]
+        finally:
+            Path(temp_path).unlink()
+
+    def test_save_without_groups_creates_valid_json(self):
+        grouper = CSVGrouper()
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            temp_path = f.name
+
+        try:
+            grouper.save_groupings(temp_path)
+
+            with open(temp_path) as f:
+                assert json.load(f) == {"files": {}, "groups": {}, "sample_rows": 5}
+        finally:
+            Path(temp_path).unlink()
+
+    def test_load_shares_header_strings_per_grouper(self):
+        grouper = CSVGrouper()
+        grouper._files = {
+            f"/{i}.csv": CSVFile(path=f"/{i}.csv", headers=["".join(["i", "d"])])
+            for i in range(2)
+        }
+        grouper.group_by_exact_match()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "groupings.json"
+            grouper.save_groupings(path)
+            loaded = CSVGrouper()
+            loaded.load_groupings(path)
+
+        file1, file2 = loaded._files.values()
+        assert file1.headers[0] is file2.headers[0]
+        assert loaded._names == {"id": "id"}
+        assert CSVGrouper()._names == {}
+
 
 class TestCSVGrouperProcessing:
     """Tests for processor registration and execution."""